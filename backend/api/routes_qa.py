@@ -1,9 +1,18 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from backend.rag.retriever import Retriever
+from backend.rag.alias_lookup import AliasLookup
+from backend.rag.alignment import ParagraphAligner
+from backend.rag.pipeline import gather_with_deadline
 from backend.rag.prompt_templates import QA_PROMPT
+from backend.graph.neo4j_async import AsyncNeo4jClient
+import asyncio
 import logging
+import os
+import threading
 
 router = APIRouter()
 
@@ -11,6 +20,21 @@ router = APIRouter()
 class QARequest(BaseModel):
     question: str
     lang: str = "zh"  # Default to Chinese
+    deadline: Optional[float] = Field(None, gt=0)  # Seconds; defaults to QA_DEADLINE_SECONDS
+    diverse: bool = False  # Rerank evidence so it covers distinct passages
+
+class ParagraphRef(BaseModel):
+    work_id: str
+    para_id: str
+    lang: str
+
+class AlignedPassage(BaseModel):
+    work_id: str
+    para_id: str
+    lang: str
+    text: str
+    confidence: float
+    mutual: bool
 
 class Evidence(BaseModel):
     work_id: str
@@ -18,6 +42,8 @@ class Evidence(BaseModel):
     lang: str
     text: str
     score: float
+    aligned: List[AlignedPassage] = []  # Counterparts of this paragraph in the other languages
+    duplicates: List[ParagraphRef] = []  # Near-duplicate paragraphs collapsed into this one at ingest
 
 class GraphHit(BaseModel):
     entity_id: str
@@ -29,6 +55,31 @@ class QAResponse(BaseModel):
     answer: str
     evidence: List[Evidence]
     graph_hits: List[GraphHit]
+    partial: bool = False  # True if any retrieval source missed the deadline or failed
+    degraded_sources: List[str] = []
+
+# Retrieval fan-out settings
+QA_DEADLINE_SECONDS = float(os.getenv("QA_DEADLINE_SECONDS", "3.0"))
+# Extra time optional sources (graph, alias) get once dense search has returned
+QA_OPTIONAL_GRACE_SECONDS = float(os.getenv("QA_OPTIONAL_GRACE_SECONDS", "0.25"))
+GRAPH_NEIGHBORS = int(os.getenv("QA_GRAPH_NEIGHBORS", "5"))
+
+# Bounded pool for CPU-bound embedding + FAISS search, so a burst of requests
+# queues here instead of oversubscribing the cores
+RETRIEVAL_WORKERS = int(os.getenv("RETRIEVAL_WORKERS", "4"))
+search_executor = ThreadPoolExecutor(
+    max_workers=RETRIEVAL_WORKERS,
+    thread_name_prefix="retrieval"
+)
+
+# Cancelling a search that missed its deadline does not stop its worker
+# thread, so cap the searches in flight (running or queued); beyond that new
+# requests fail fast with 503 instead of queueing behind abandoned searches
+RETRIEVAL_MAX_IN_FLIGHT = int(os.getenv("RETRIEVAL_MAX_IN_FLIGHT", str(2 * RETRIEVAL_WORKERS)))
+search_slots = threading.BoundedSemaphore(RETRIEVAL_MAX_IN_FLIGHT)
+
+class SearchOverloaded(Exception):
+    """Raised when too many dense searches are already in flight."""
 
 # Initialize retriever
 try:
@@ -37,14 +88,89 @@ except Exception as e:
     logging.error(f"Failed to initialize retriever: {e}")
     retriever = None
 
+# Initialize alias lookup
+try:
+    alias_lookup = AliasLookup()
+except Exception as e:
+    logging.error(f"Failed to initialize alias lookup: {e}")
+    alias_lookup = None
+
+# Initialize cross-lingual alignment index (built offline by scripts/bootstrap_data.py)
+try:
+    aligner = ParagraphAligner(fingerprint=retriever.fingerprint) if retriever else None
+except Exception as e:
+    logging.error(f"Failed to load paragraph alignment: {e}")
+    aligner = None
+
+# Initialize async graph client (the driver connects lazily on first query)
+try:
+    graph_client = AsyncNeo4jClient()
+except Exception as e:
+    logging.error(f"Failed to initialize Neo4j client: {e}")
+    graph_client = None
+
+async def close_clients():
+    """Release the graph driver and search threads on application shutdown."""
+    if graph_client:
+        await graph_client.close()
+    search_executor.shutdown(wait=False)
+
+async def _dense_search(question: str, lang: str, diverse: bool):
+    if not search_slots.acquire(blocking=False):
+        raise SearchOverloaded(f"{RETRIEVAL_MAX_IN_FLIGHT} dense searches already in flight")
+    try:
+        future = search_executor.submit(partial(retriever.retrieve, question, lang=lang, diverse=diverse))
+    except Exception:
+        search_slots.release()
+        raise
+    # Free the slot when the thread finishes, not when the request gives up on it
+    future.add_done_callback(lambda _: search_slots.release())
+    return await asyncio.wrap_future(future)
+
+async def _alias_search(question: str):
+    # Regex matching over every alias is blocking work, keep it off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, alias_lookup.lookup, question)
+
+async def _graph_search(alias_task: asyncio.Future):
+    # Expand only the concepts the alias lookup found in the question
+    concepts = await alias_task
+    return await graph_client.neighbors_for_concepts(
+        [concept['entity_id'] for concept in concepts], k=GRAPH_NEIGHBORS
+    )
+
 @router.post("/rag", response_model=QAResponse)
 async def qa_rag(request: QARequest):
     if not retriever:
         raise HTTPException(status_code=500, detail="Retriever not initialized")
     
     try:
-        # Retrieve relevant documents
-        relevant_docs = retriever.retrieve(request.question, lang=request.lang)
+        # Fan out to all retrieval sources concurrently; only dense search is
+        # required, the others are dropped if they are still running a short
+        # grace period after it returns
+        sources = {"dense": _dense_search(request.question, request.lang, request.diverse)}
+        if alias_lookup:
+            sources["alias"] = asyncio.ensure_future(_alias_search(request.question))
+            if graph_client:
+                sources["graph"] = _graph_search(sources["alias"])
+
+        results, errors = await gather_with_deadline(
+            sources,
+            timeout=QA_DEADLINE_SECONDS if request.deadline is None else request.deadline,
+            required=["dense"],
+            optional_grace=QA_OPTIONAL_GRACE_SECONDS
+        )
+        
+        # Dense search is required: without it there is no evidence to answer from
+        if "dense" in errors:
+            if isinstance(errors["dense"], asyncio.TimeoutError):
+                raise HTTPException(status_code=504, detail="Dense retrieval timed out")
+            if isinstance(errors["dense"], SearchOverloaded):
+                raise HTTPException(status_code=503, detail="Too many retrieval requests in flight, retry later")
+            raise HTTPException(status_code=500, detail=f"Dense retrieval failed: {errors['dense']}")
+        
+        relevant_docs = results["dense"]
+        degraded_sources = list(errors)
         
         # Format evidence for prompt
         evidence_blocks = []
@@ -66,29 +192,58 @@ async def qa_rag(request: QARequest):
         # Format evidence for response
         formatted_evidence = []
         for doc in relevant_docs:
+            aligned = []
+            if aligner:
+                for counterpart in aligner.lookup(doc['work_id'], doc['para_id'], doc['lang']):
+                    paragraph = retriever.get_paragraph(counterpart['work_id'], counterpart['para_id'], counterpart['lang'])
+                    if paragraph is None:
+                        # Alignment predates a corpus or deduplication change
+                        continue
+                    aligned.append(AlignedPassage(
+                        work_id=counterpart['work_id'],
+                        para_id=counterpart['para_id'],
+                        lang=counterpart['lang'],
+                        text=paragraph['text'][:200] + "..." if len(paragraph['text']) > 200 else paragraph['text'],
+                        confidence=counterpart['confidence'],
+                        mutual=counterpart['mutual']
+                    ))
             formatted_evidence.append(Evidence(
                 work_id=doc['work_id'],
                 para_id=doc['para_id'],
                 lang=doc['lang'],
                 text=doc['text'][:200] + "..." if len(doc['text']) > 200 else doc['text'],  # Truncate long texts
-                score=doc.get('score', 0.0)
+                score=doc.get('score', 0.0),
+                aligned=aligned,
+                duplicates=[ParagraphRef(**ref) for ref in doc.get('duplicates', [])]
             ))
         
-        # Mock graph hits (in a real system, this would come from graph queries)
-        graph_hits = [
-            GraphHit(
-                entity_id="kant",
-                entity_type="Person",
-                name="Immanuel Kant",
-                relationship="author"
-            )
-        ]
+        # Concepts named directly in the question come first, followed by
+        # their neighbours in the knowledge graph
+        graph_hits = []
+        seen_entities = set()
+        for concept in results.get("alias", []):
+            seen_entities.add(concept['entity_id'])
+            graph_hits.append(GraphHit(
+                entity_id=concept['entity_id'],
+                entity_type="Concept",
+                name=concept['name'],
+                relationship="alias_match"
+            ))
+        for neighbor in results.get("graph", []):
+            if neighbor['entity_id'] in seen_entities:
+                continue
+            seen_entities.add(neighbor['entity_id'])
+            graph_hits.append(GraphHit(**neighbor))
         
         return QAResponse(
             answer=answer,
             evidence=formatted_evidence,
-            graph_hits=graph_hits
+            graph_hits=graph_hits,
+            partial=bool(degraded_sources),
+            degraded_sources=degraded_sources
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error in QA RAG: {e}")
         raise HTTPException(status_code=500, detail=f"Error processing QA request: {str(e)}")
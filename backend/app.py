@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.api.routes_qa import router as qa_router
+from backend.api.routes_qa import router as qa_router, close_clients
 import os
 from dotenv import load_dotenv
 
@@ -25,6 +25,10 @@ app.add_middleware(
 # Include API routes
 app.include_router(qa_router, prefix="/qa", tags=["qa"])
 
+@app.on_event("shutdown")
+async def shutdown():
+    await close_clients()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Meet-Kant API", "project": "meet-kant"}
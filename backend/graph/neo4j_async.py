@@ -0,0 +1,59 @@
+from neo4j import AsyncGraphDatabase
+import logging
+from typing import Dict, List
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+class AsyncNeo4jClient:
+    def __init__(self):
+        # Get Neo4j connection details from environment variables
+        uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+        user = os.getenv("NEO4J_USER", "neo4j")
+        password = os.getenv("NEO4J_PASSWORD", "password")
+
+        self.driver = AsyncGraphDatabase.driver(uri, auth=(user, password))
+
+    async def close(self):
+        """Close the async Neo4j driver connection"""
+        await self.driver.close()
+
+    async def neighbors_for_concepts(self, concept_ids: List[str], k: int = 5) -> List[Dict[str, str]]:
+        """
+        Return the graph neighbours of the given concepts.
+
+        Concepts are looked up by id on the Concept label so the query uses
+        the concept_id index; matching the question against aliases is left
+        to AliasLookup, which respects word boundaries.
+
+        Args:
+            concept_ids: IDs of the concepts named in the question
+            k: Maximum number of neighbours to return
+
+        Returns:
+            List of neighbour entities with the relationship that links them
+        """
+        if not concept_ids:
+            return []
+
+        async with self.driver.session() as session:
+            result = await session.run(
+                """
+                MATCH (n:Concept)
+                WHERE n.id IN $concept_ids
+                MATCH (n)-[r]-(m)
+                RETURN DISTINCT m.id AS entity_id,
+                       labels(m)[0] AS entity_type,
+                       coalesce(m.label, m.name_en, m.title_en, m.id) AS name,
+                       type(r) AS relationship
+                LIMIT $k
+                """,
+                concept_ids=concept_ids,
+                k=k
+            )
+            records = await result.data()
+
+        logging.debug(f"Graph neighbourhood returned {len(records)} entities")
+        return records
@@ -0,0 +1,64 @@
+import pandas as pd
+import re
+from typing import List, Dict
+import logging
+import os
+
+class AliasLookup:
+    def __init__(self, concepts_path: str = "resource/kant/concepts.csv"):
+        """
+        Initialize the alias lookup from the concepts CSV.
+
+        Args:
+            concepts_path: Path to the concepts CSV with multilingual aliases
+        """
+        self.concepts_path = concepts_path
+        self.aliases = {}  # lowercased alias -> concept record
+
+        if os.path.exists(concepts_path):
+            self._load_aliases()
+        else:
+            logging.warning(f"Concepts file not found: {concepts_path}")
+
+    def _load_aliases(self):
+        """Load concept labels and their ';'-separated aliases into memory."""
+        df = pd.read_csv(self.concepts_path)
+
+        for _, row in df.iterrows():
+            concept = {'entity_id': row['id'], 'name': row['label']}
+            names = [row['label']]
+            for column in ('alias_en', 'alias_zh', 'alias_de'):
+                if pd.notna(row.get(column)):
+                    names.extend(str(row[column]).split(';'))
+
+            for name in names:
+                name = str(name).strip().lower()
+                if name:
+                    self.aliases[name] = concept
+
+        logging.info(f"Loaded {len(self.aliases)} aliases from {self.concepts_path}")
+
+    def lookup(self, question: str) -> List[Dict[str, str]]:
+        """
+        Find concepts whose label or alias appears in the question.
+
+        Args:
+            question: User question text
+
+        Returns:
+            List of matched concepts with the alias that matched
+        """
+        question = question.lower()
+        matches = {}
+        for alias, concept in self.aliases.items():
+            if concept['entity_id'] in matches:
+                continue
+            # Latin-script aliases must match whole words so short ones like
+            # "ci" don't hit inside unrelated words; CJK has no word boundaries
+            if alias.isascii():
+                found = re.search(r'\b' + re.escape(alias) + r'\b', question) is not None
+            else:
+                found = alias in question
+            if found:
+                matches[concept['entity_id']] = {**concept, 'alias': alias}
+        return list(matches.values())
@@ -0,0 +1,139 @@
+import json
+from typing import List, Dict, Any
+from collections import defaultdict
+import logging
+import os
+
+def paragraph_key(work_id: str, para_id: str, lang: str) -> str:
+    """Build the lookup key identifying a paragraph in the alignment index."""
+    return f"{work_id}:{para_id}:{lang}"
+
+class ParagraphAligner:
+    def __init__(self, alignment_path: str = "resource/kant/alignment.json",
+                 min_confidence: float = 0.5, fingerprint: str = None):
+        """
+        Initialize the cross-lingual paragraph alignment index.
+
+        Args:
+            alignment_path: Path to the persisted alignment JSON file
+            min_confidence: Minimum cosine similarity for a counterpart to be kept
+            fingerprint: Corpus fingerprint of the Retriever being served; a
+                persisted alignment built from a different corpus is not loaded
+        """
+        self.alignment_path = alignment_path
+        self.min_confidence = min_confidence
+        self.fingerprint = fingerprint
+        self.alignments = {}
+
+        if os.path.exists(alignment_path):
+            self._load_alignment()
+
+    def build(self, retriever):
+        """
+        Align the retriever's paragraphs across languages and persist the mapping.
+
+        Paragraphs are only aligned within the same work. For every paragraph
+        and every other language of that work, the counterpart with the highest
+        multilingual embedding similarity is recorded together with its score
+        and whether the match is mutual (each is the other's best counterpart).
+        The embeddings are read back from the retriever's FAISS index rather
+        than recomputed. Only paragraph identifiers are persisted, tagged with
+        the retriever's corpus fingerprint; texts are resolved against the
+        retriever at query time.
+
+        Args:
+            retriever: Retriever whose deduplicated paragraphs and index the API serves
+        """
+        texts_data = retriever.texts_data
+        if not texts_data or retriever.index is None:
+            logging.warning("No texts to build alignment from")
+            return
+
+        # Index rows are the L2-normalized paragraph embeddings, in texts_data
+        # order, so inner product is cosine similarity
+        embeddings = retriever.index.reconstruct_n(0, retriever.index.ntotal)
+        self.fingerprint = retriever.fingerprint
+
+        # Group paragraph positions by work and language
+        groups = defaultdict(lambda: defaultdict(list))
+        for i, item in enumerate(texts_data):
+            groups[item['work_id']][item['lang']].append(i)
+
+        self.alignments = {}
+        for work_id, by_lang in groups.items():
+            for src_lang, src_rows in by_lang.items():
+                for tgt_lang, tgt_rows in by_lang.items():
+                    if tgt_lang == src_lang:
+                        continue
+
+                    similarities = embeddings[src_rows] @ embeddings[tgt_rows].T
+                    best_targets = similarities.argmax(axis=1)
+                    best_sources = similarities.argmax(axis=0)
+
+                    for s, t in enumerate(best_targets):
+                        confidence = float(similarities[s, t])
+                        if confidence < self.min_confidence:
+                            continue
+
+                        source = texts_data[src_rows[s]]
+                        target = texts_data[tgt_rows[t]]
+                        key = paragraph_key(source['work_id'], source['para_id'], source['lang'])
+                        self.alignments.setdefault(key, {})[tgt_lang] = {
+                            'work_id': target['work_id'],
+                            'para_id': target['para_id'],
+                            'lang': target['lang'],
+                            'confidence': confidence,
+                            'mutual': bool(best_sources[t] == s)
+                        }
+
+        self._save_alignment()
+        logging.info(f"Built and saved alignment for {len(self.alignments)} paragraphs")
+
+    def _save_alignment(self):
+        """Persist the alignment mapping as JSON, tagged with the corpus fingerprint."""
+        with open(self.alignment_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self.fingerprint, 'alignments': self.alignments}, f, ensure_ascii=False)
+
+    def _load_alignment(self):
+        """Load the pre-built alignment mapping if it matches the expected corpus."""
+        with open(self.alignment_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if self.fingerprint is not None and data.get('fingerprint') != self.fingerprint:
+            logging.warning(f"Ignoring stale alignment {self.alignment_path}: built from a different corpus, "
+                            f"rerun scripts/bootstrap_data.py to rebuild it")
+            return
+
+        self.alignments = data.get('alignments', {})
+        logging.info(f"Loaded alignment for {len(self.alignments)} paragraphs")
+
+    def lookup(self, work_id: str, para_id: str, lang: str) -> List[Dict[str, Any]]:
+        """
+        Return the aligned counterparts of a paragraph in the other languages.
+
+        Args:
+            work_id: Work ID of the paragraph
+            para_id: Paragraph ID within the work
+            lang: Language of the paragraph
+
+        Returns:
+            List of aligned paragraph identifiers with confidence scores, best first
+        """
+        counterparts = self.alignments.get(paragraph_key(work_id, para_id, lang), {})
+        return sorted(counterparts.values(), key=lambda c: c['confidence'], reverse=True)
+
+
+# Build the alignment index offline
+if __name__ == "__main__":
+    from backend.rag.retriever import Retriever
+
+    # Same defaults as the API, so the alignment covers the deduplicated paragraphs it serves
+    retriever = Retriever()
+    aligner = ParagraphAligner(fingerprint=retriever.fingerprint)
+    aligner.build(retriever)
+
+    for key, counterparts in aligner.alignments.items():
+        print(key)
+        for lang, counterpart in counterparts.items():
+            print(f"  -> {counterpart['work_id']}:{counterpart['para_id']}:{lang} "
+                  f"(confidence {counterpart['confidence']:.4f}, mutual {counterpart['mutual']})")
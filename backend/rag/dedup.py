@@ -0,0 +1,129 @@
+import re
+import zlib
+import numpy as np
+from typing import List, Dict, Any, Optional
+from collections import defaultdict
+import logging
+
+# Mersenne prime used as the modulus of the MinHash permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+
+class NearDuplicateDetector:
+    def __init__(self, num_perm: int = 128, bands: int = 32, threshold: float = 0.8,
+                 shingle_size: int = 5, seed: int = 1):
+        """
+        Initialize the MinHash/LSH near-duplicate detector.
+
+        Args:
+            num_perm: Number of MinHash permutations per signature
+            bands: Number of LSH bands; num_perm must be divisible by it
+            threshold: Minimum estimated Jaccard similarity for two paragraphs to be duplicates
+            shingle_size: Length of the character shingles (works for CJK as well as Latin text)
+            seed: Seed for the permutation coefficients, so clusters are reproducible
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        # Settings that determine the clusters, e.g. for invalidating persisted ones
+        self.params = {
+            'num_perm': num_perm,
+            'bands': bands,
+            'threshold': threshold,
+            'shingle_size': shingle_size,
+            'seed': seed
+        }
+
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def _shingles(self, text: str) -> set:
+        """Split normalized text into overlapping character shingles."""
+        text = re.sub(r'\s+', ' ', text.lower()).strip()
+        if not text:
+            return set()
+        if len(text) <= self.shingle_size:
+            return {text}
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Array of num_perm minimum hash values, or None if the text is empty
+        """
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        hashes = np.array([zlib.crc32(s.encode('utf-8')) for s in shingles], dtype=np.uint64)
+        # (a * x + b) mod p; crc32 values are below 2**32 so the product wraps
+        # modulo 2**64, which is fine for a hash family
+        permuted = (np.outer(hashes, self.a) + self.b) % np.uint64(_MERSENNE_PRIME)
+        return permuted.min(axis=0)
+
+    def cluster(self, texts_data: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Group near-duplicate paragraphs into clusters.
+
+        Paragraphs are only compared within the same language. Candidate pairs
+        come from LSH band collisions and are confirmed by their estimated
+        Jaccard similarity before being merged. Paragraphs that are empty after
+        normalization are never merged and stay in clusters of their own.
+
+        Args:
+            texts_data: Paragraph records with lang and text
+
+        Returns:
+            Clusters as lists of positions into texts_data, each in load order;
+            the first position of a cluster is its representative
+        """
+        signatures = [self.signature(item['text']) for item in texts_data]
+
+        # Union-find over paragraph positions
+        parent = list(range(len(texts_data)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        buckets = defaultdict(list)
+        for i, (item, sig) in enumerate(zip(texts_data, signatures)):
+            if sig is None:
+                continue
+            for band in range(self.bands):
+                band_sig = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+                buckets[(item['lang'], band, band_sig)].append(i)
+
+        for members in buckets.values():
+            # Compare each member against one member per cluster already seen in
+            # this bucket, so a bucket of n copies costs O(n) comparisons, not O(n^2)
+            seen = []
+            for j in members:
+                for i in seen:
+                    root_i, root_j = find(i), find(j)
+                    if root_i == root_j:
+                        break
+                    if np.mean(signatures[i] == signatures[j]) >= self.threshold:
+                        # Keep the earliest paragraph as root so it becomes the representative
+                        parent[max(root_i, root_j)] = min(root_i, root_j)
+                        break
+                else:
+                    seen.append(j)
+
+        clusters = defaultdict(list)
+        for i in range(len(texts_data)):
+            clusters[find(i)].append(i)
+
+        logging.info(f"Clustered {len(texts_data)} paragraphs into {len(clusters)} near-duplicate groups")
+        return sorted(clusters.values(), key=lambda members: members[0])
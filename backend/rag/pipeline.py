@@ -0,0 +1,69 @@
+import asyncio
+from typing import Any, Awaitable, Dict, Iterable, Optional, Tuple
+import logging
+
+async def gather_with_deadline(sources: Dict[str, Awaitable], timeout: float,
+                               required: Iterable[str] = (),
+                               optional_grace: Optional[float] = None) -> Tuple[Dict[str, Any], Dict[str, BaseException]]:
+    """
+    Run retrieval sources concurrently and collect whatever finishes in time.
+
+    Required sources are awaited first; once they have all succeeded, the
+    optional sources get at most optional_grace more seconds (or the rest of
+    the deadline if no grace is given), so a hanging optional source does not
+    push latency past that of the slowest required one by more than the grace.
+    The call returns as soon as every source has finished, a required source
+    has failed, or the deadline or grace period passes. Sources that are still
+    running then, or that raised, are reported as degraded; it is up to the
+    caller to fail the request when a required source is among them.
+
+    Args:
+        sources: Mapping of source name to the awaitable producing its results
+        timeout: Deadline in seconds for the whole fan-out
+        required: Names of the sources the response cannot be built without
+        optional_grace: Extra seconds optional sources may run after the
+            required ones have succeeded; only applies when sources are required
+
+    Returns:
+        Tuple of (results keyed by source name, errors of degraded sources
+        keyed by source name); a source that missed the deadline or grace
+        period maps to an asyncio.TimeoutError
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    tasks = {name: asyncio.ensure_future(source) for name, source in sources.items()}
+    required_tasks = [tasks[name] for name in required if name in tasks]
+
+    if required_tasks:
+        await asyncio.wait(required_tasks, timeout=timeout)
+
+    # Optional sources may run a little longer (bounded by the grace period
+    # and the deadline), unless a required source has already failed and the
+    # response cannot be built anyway
+    required_ok = all(task.done() and not task.cancelled() and task.exception() is None
+                      for task in required_tasks)
+    pending = [task for task in tasks.values() if not task.done()]
+    remaining = deadline - loop.time()
+    if required_tasks and optional_grace is not None:
+        remaining = min(remaining, optional_grace)
+    if required_ok and pending and remaining > 0:
+        await asyncio.wait(pending, timeout=remaining)
+
+    results = {}
+    errors = {}
+    for name, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            message = f"Retrieval source '{name}' did not finish in time"
+            if required_ok:
+                logging.warning(message)
+            errors[name] = asyncio.TimeoutError(message)
+        elif task.cancelled():
+            errors[name] = asyncio.CancelledError(f"Retrieval source '{name}' was cancelled")
+        elif task.exception() is not None:
+            logging.warning(f"Retrieval source '{name}' failed: {task.exception()}")
+            errors[name] = task.exception()
+        else:
+            results[name] = task.result()
+
+    return results, errors
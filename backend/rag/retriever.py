@@ -1,31 +1,52 @@
 import json
+import hashlib
 import faiss
 import numpy as np
 from typing import List, Dict, Any
 from backend.rag.embedding import embedding_model
+from backend.rag.dedup import NearDuplicateDetector
 import logging
 import os
 
 class Retriever:
     def __init__(self, vector_store_path: str = "resource/kant/vector_store.index", 
-                 texts_path: str = "resource/kant/texts/"):
+                 texts_path: str = "resource/kant/texts/", deduplicate: bool = True):
         """
         Initialize the retriever with vector store and text data.
         
         Args:
             vector_store_path: Path to the FAISS vector store
             texts_path: Path to the directory containing text files
+            deduplicate: Collapse near-duplicate paragraphs before indexing
         """
         self.vector_store_path = vector_store_path
+        self.metadata_path = vector_store_path + ".meta.json"
         self.texts_path = texts_path
+        self.detector = NearDuplicateDetector() if deduplicate else None
         self.index = None
         self.texts_data = []
+        self.clusters = []  # Positions into the loaded texts; first member is indexed
+        self.paragraphs = {}  # (work_id, para_id, lang) -> indexed paragraph
         
         # Load text data from JSONL files
         self._load_texts()
+        self.fingerprint = self._corpus_fingerprint()
+        
+        # The persisted index is only valid for the exact corpus and
+        # deduplication settings it was built from
+        metadata = self._load_metadata()
+        index_current = (os.path.exists(vector_store_path) and metadata is not None
+                         and metadata.get('fingerprint') == self.fingerprint)
+        
+        # Keep one representative per near-duplicate cluster, reusing the
+        # persisted clusters when the index is current
+        self.clusters = metadata['clusters'] if index_current else self._cluster_texts()
+        self._apply_clusters()
+        
+        self.paragraphs = {(item['work_id'], item['para_id'], item['lang']): item for item in self.texts_data}
         
         # Build or load the vector index
-        if os.path.exists(vector_store_path):
+        if index_current:
             self._load_index()
         else:
             self._build_index()
@@ -34,7 +55,8 @@ class Retriever:
         """Load text data from JSONL files in the texts directory."""
         import glob
         
-        text_files = glob.glob(os.path.join(self.texts_path, "*.jsonl"))
+        # Sorted so index rows line up with texts_data on every start
+        text_files = sorted(glob.glob(os.path.join(self.texts_path, "*.jsonl")))
         
         if not text_files:
             # If no files found, create sample data
@@ -112,6 +134,55 @@ class Retriever:
                 'original': data
             })
     
+    def _corpus_fingerprint(self) -> str:
+        """Hash the ordered paragraphs and deduplication settings the index depends on."""
+        payload = {
+            'paragraphs': [[item['work_id'], item['para_id'], item['lang'], item['text']] for item in self.texts_data],
+            'dedup': self.detector.params if self.detector else None
+        }
+        return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode('utf-8')).hexdigest()
+    
+    def _load_metadata(self):
+        """Load the fingerprint and clusters persisted next to the index, if any."""
+        if not os.path.exists(self.metadata_path):
+            return None
+        try:
+            with open(self.metadata_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Ignoring unreadable index metadata {self.metadata_path}: {e}")
+            return None
+    
+    def _save_metadata(self):
+        """Persist the corpus fingerprint and cluster membership next to the index."""
+        with open(self.metadata_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self.fingerprint, 'clusters': self.clusters}, f)
+    
+    def _cluster_texts(self) -> List[List[int]]:
+        """Group near-duplicate paragraphs, or keep every paragraph on its own."""
+        if self.detector is None:
+            return [[i] for i in range(len(self.texts_data))]
+        return self.detector.cluster(self.texts_data)
+    
+    def _apply_clusters(self):
+        """Collapse near-duplicate paragraphs into one representative per cluster."""
+        representatives = []
+        for members in self.clusters:
+            representative = self.texts_data[members[0]]
+            # Record the collapsed paragraphs so they can still be cited
+            representative['duplicates'] = [
+                {
+                    'work_id': self.texts_data[i]['work_id'],
+                    'para_id': self.texts_data[i]['para_id'],
+                    'lang': self.texts_data[i]['lang']
+                }
+                for i in members[1:]
+            ]
+            representatives.append(representative)
+        
+        logging.info(f"Collapsed {len(self.texts_data) - len(representatives)} near-duplicate paragraphs")
+        self.texts_data = representatives
+    
     def _build_index(self):
         """Build the FAISS vector index from text data."""
         if not self.texts_data:
@@ -138,16 +209,38 @@ class Retriever:
         # Add embeddings to index
         self.index.add(embeddings)
         
-        # Save the index
+        # Save the index along with what it was built from
         faiss.write_index(self.index, self.vector_store_path)
+        self._save_metadata()
         logging.info(f"Built and saved FAISS index with {len(texts)} vectors")
     
     def _load_index(self):
         """Load the pre-built FAISS vector index."""
         self.index = faiss.read_index(self.vector_store_path)
         logging.info(f"Loaded FAISS index with {self.index.ntotal} vectors")
+        
+        # Fingerprint already matched; this only guards against a metadata
+        # file that was copied without its index
+        if self.index.ntotal != len(self.texts_data):
+            logging.warning(f"FAISS index has {self.index.ntotal} vectors but {len(self.texts_data)} texts were loaded, rebuilding")
+            self._build_index()
     
-    def retrieve(self, query: str, top_k: int = 5, lang: str = None) -> List[Dict[str, Any]]:
+    def get_paragraph(self, work_id: str, para_id: str, lang: str) -> Dict[str, Any]:
+        """
+        Look up an indexed paragraph by its identifiers.
+        
+        Args:
+            work_id: Work ID of the paragraph
+            para_id: Paragraph ID within the work
+            lang: Language of the paragraph
+            
+        Returns:
+            The paragraph record, or None if it is not in the index
+        """
+        return self.paragraphs.get((work_id, para_id, lang))
+    
+    def retrieve(self, query: str, top_k: int = 5, lang: str = None,
+                 diverse: bool = False, mmr_lambda: float = 0.5) -> List[Dict[str, Any]]:
         """
         Retrieve relevant documents for a query.
         
@@ -155,6 +248,8 @@ class Retriever:
             query: Input query text
             top_k: Number of top results to return
             lang: Language filter (optional)
+            diverse: Rerank candidates with maximal marginal relevance so results cover distinct passages
+            mmr_lambda: Trade-off between relevance (1.0) and diversity (0.0) in diverse mode
             
         Returns:
             List of relevant documents with metadata
@@ -174,6 +269,7 @@ class Retriever:
         scores, indices = self.index.search(query_embedding, min(top_k * 3, len(self.texts_data)))  # Get more results than needed for filtering
         
         results = []
+        candidate_ids = []
         for i, idx in enumerate(indices[0]):
             if idx < len(self.texts_data):
                 text_data = self.texts_data[idx]
@@ -187,12 +283,45 @@ class Retriever:
                     'para_id': text_data['para_id'], 
                     'lang': text_data['lang'],
                     'text': text_data['text'],
-                    'score': float(scores[0][i])
+                    'score': float(scores[0][i]),
+                    'duplicates': text_data.get('duplicates', [])
                 }
                 results.append(result)
+                candidate_ids.append(int(idx))
+        
+        if diverse and len(results) > top_k:
+            return self._rerank_mmr(results, candidate_ids, top_k, mmr_lambda)
         
         # Return top_k results after filtering
         return results[:top_k]
+    
+    def _rerank_mmr(self, results: List[Dict[str, Any]], candidate_ids: List[int],
+                    top_k: int, mmr_lambda: float) -> List[Dict[str, Any]]:
+        """
+        Select top_k results by maximal marginal relevance.
+        
+        Args:
+            results: Candidate results sorted by relevance
+            candidate_ids: Index positions of the candidates
+            top_k: Number of results to select
+            mmr_lambda: Trade-off between relevance (1.0) and diversity (0.0)
+            
+        Returns:
+            Selected results in selection order
+        """
+        # Stored vectors are already L2-normalized, so inner product is cosine similarity
+        vectors = np.vstack([self.index.reconstruct(idx) for idx in candidate_ids])
+        similarities = vectors @ vectors.T
+        relevance = np.array([result['score'] for result in results])
+        
+        selected = [0]
+        remaining = list(range(1, len(results)))
+        while remaining and len(selected) < top_k:
+            redundancy = similarities[np.ix_(remaining, selected)].max(axis=1)
+            mmr = mmr_lambda * relevance[remaining] - (1 - mmr_lambda) * redundancy
+            selected.append(remaining.pop(int(mmr.argmax())))
+        
+        return [results[i] for i in selected]
 
 
 # Example usage
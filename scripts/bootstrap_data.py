@@ -2,6 +2,7 @@
 Script to bootstrap the Kant knowledge system:
 1. Load graph data into Neo4j
 2. Create vector store from text data
+3. Build the cross-lingual paragraph alignment index
 """
 
 import os
@@ -13,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent / "backend"))
 
 from backend.graph.neo4j_loader import load_all_data
 from backend.rag.retriever import Retriever
+from backend.rag.alignment import ParagraphAligner
 
 def main():
     print("🤖 Starting Meet-Kant data bootstrap process...")
@@ -37,6 +39,16 @@ def main():
         print(f"❌ Error creating vector store: {e}")
         return 1
     
+    # Step 3: Align paragraphs across languages
+    print("\n3. Building cross-lingual paragraph alignment...")
+    try:
+        aligner = ParagraphAligner(fingerprint=retriever.fingerprint)
+        aligner.build(retriever)
+        print("✅ Paragraph alignment built successfully")
+    except Exception as e:
+        print(f"❌ Error building paragraph alignment: {e}")
+        return 1
+    
     print("\n🎉 Bootstrap process completed successfully!")
     print("\nTo start the API server:")
     print("1. cd backend")
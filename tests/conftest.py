@@ -0,0 +1,61 @@
+import json
+import sys
+import types
+import numpy as np
+import pytest
+
+
+class _UnloadedSentenceTransformer:
+    """Stand-in so importing backend.rag.embedding never downloads a model."""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def encode(self, texts):
+        raise RuntimeError("No embedding model in unit tests; monkeypatch embedding_model instead")
+
+
+# Tests that need embeddings monkeypatch embedding_model.embed_text/embed_texts
+# with fixed vectors
+_stub = types.ModuleType("sentence_transformers")
+_stub.SentenceTransformer = _UnloadedSentenceTransformer
+sys.modules["sentence_transformers"] = _stub
+
+
+class FakeEmbeddings(dict):
+    """Fixed embeddings keyed by text; every query embeds to self['QUERY']."""
+
+    def __init__(self):
+        super().__init__()
+        self.embed_texts_calls = 0
+
+    def embed_texts(self, texts):
+        self.embed_texts_calls += 1
+        return np.array([self[text] for text in texts], dtype='float32')
+
+    def embed_text(self, text):
+        return np.array(self['QUERY'], dtype='float32')
+
+
+@pytest.fixture
+def vectors(monkeypatch):
+    """Route embedding_model through a FakeEmbeddings table for the test."""
+    from backend.rag.embedding import embedding_model
+
+    fake = FakeEmbeddings()
+    monkeypatch.setattr(embedding_model, "embed_texts", fake.embed_texts)
+    monkeypatch.setattr(embedding_model, "embed_text", fake.embed_text)
+    return fake
+
+
+def _write_corpus(texts_dir, paragraphs):
+    texts_dir.mkdir(exist_ok=True)
+    with open(texts_dir / "works.jsonl", 'w', encoding='utf-8') as f:
+        for work_id, para_id, lang, text in paragraphs:
+            f.write(json.dumps({'work_id': work_id, 'para_id': para_id, 'lang': lang, 'text': text}, ensure_ascii=False) + "\n")
+
+
+@pytest.fixture
+def write_corpus():
+    """Write (work_id, para_id, lang, text) tuples as a JSONL corpus directory."""
+    return _write_corpus
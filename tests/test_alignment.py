@@ -0,0 +1,84 @@
+import pytest
+from backend.rag.alignment import ParagraphAligner
+from backend.rag.retriever import Retriever
+
+
+@pytest.fixture
+def retriever(tmp_path, vectors, write_corpus):
+    vectors.update({
+        "critique en 1": [1, 0, 0, 0],
+        "critique en 2": [0, 1, 0, 0],
+        "critique de 1": [0.8, 0.6, 0, 0],
+        "critique zh 1": [0, 0.7, 0.714, 0],
+        # Same vector as "critique en 1", but in another work
+        "groundwork en 1": [1, 0, 0, 0],
+        "groundwork de 1": [0, 0, 0, 1]
+    })
+    write_corpus(tmp_path / "texts", [
+        ("pure_reason", "1", "en", "critique en 1"),
+        ("pure_reason", "2", "en", "critique en 2"),
+        ("pure_reason", "3", "de", "critique de 1"),
+        ("pure_reason", "4", "zh", "critique zh 1"),
+        ("groundwork", "1", "en", "groundwork en 1"),
+        ("groundwork", "2", "de", "groundwork de 1")
+    ])
+    return Retriever(vector_store_path=str(tmp_path / "vector_store.index"),
+                     texts_path=str(tmp_path / "texts"), deduplicate=False)
+
+
+@pytest.fixture
+def aligner(tmp_path, retriever):
+    aligner = ParagraphAligner(alignment_path=str(tmp_path / "alignment.json"),
+                               fingerprint=retriever.fingerprint)
+    aligner.build(retriever)
+    return aligner
+
+
+def _refs(counterparts):
+    return [(c['work_id'], c['para_id'], c['lang']) for c in counterparts]
+
+
+def test_each_other_language_gets_best_counterpart(aligner):
+    counterparts = aligner.lookup("pure_reason", "2", "en")
+
+    assert _refs(counterparts) == [("pure_reason", "4", "zh"), ("pure_reason", "3", "de")]
+    assert [c['confidence'] for c in counterparts] == pytest.approx([0.7, 0.6], abs=1e-3)
+
+
+def test_mutual_flag(aligner):
+    # en 1 and de 1 are each other's best match; de 1 is also en 2's best
+    # German match, but de 1 prefers en 1, so that pair is not mutual
+    assert aligner.lookup("pure_reason", "1", "en")[0]['mutual'] is True
+    assert [c['mutual'] for c in aligner.lookup("pure_reason", "2", "en")] == [True, False]
+    assert _refs(aligner.lookup("pure_reason", "3", "de")) == [("pure_reason", "1", "en")]
+
+
+def test_min_confidence_filters_weak_matches(aligner):
+    # en 1's best Chinese match has similarity 0, below the 0.5 default
+    assert _refs(aligner.lookup("pure_reason", "1", "en")) == [("pure_reason", "3", "de")]
+
+
+def test_alignment_stays_within_work(aligner):
+    # groundwork en 1 has the same vector as pure_reason en 1, but only
+    # groundwork de 1 (similarity 0) is a candidate for it
+    assert aligner.lookup("groundwork", "1", "en") == []
+    assert all(c['work_id'] == "pure_reason" for c in aligner.lookup("pure_reason", "3", "de"))
+
+
+def test_lookup_unknown_paragraph_returns_empty(aligner):
+    assert aligner.lookup("pure_reason", "99", "en") == []
+
+
+def test_round_trip_through_file(tmp_path, aligner, retriever):
+    loaded = ParagraphAligner(alignment_path=str(tmp_path / "alignment.json"),
+                              fingerprint=retriever.fingerprint)
+
+    assert loaded.alignments == aligner.alignments
+    assert loaded.lookup("pure_reason", "2", "en") == aligner.lookup("pure_reason", "2", "en")
+
+
+def test_stale_fingerprint_loads_nothing(tmp_path, aligner):
+    loaded = ParagraphAligner(alignment_path=str(tmp_path / "alignment.json"),
+                              fingerprint="another corpus")
+
+    assert loaded.alignments == {}
@@ -0,0 +1,71 @@
+import time
+import pytest
+from backend.rag.dedup import NearDuplicateDetector
+
+CI_EN = "Kant introduces the concept of the categorical imperative as a fundamental principle of morality."
+CI_EN_EDITION = "Kant introduces the concept of the categorical imperative as the fundamental principle of morality."
+PHENOMENON_EN = "The phenomenon is the world as we experience it, while the noumenon is the thing-in-itself."
+CI_ZH = "康德引入了定言令式的概念，作为道德的根本原则。"
+CI_ZH_EDITION = "康德引入了定言令式的概念，作为道德的根本原则"
+
+
+def _paragraphs(*items):
+    return [{'lang': lang, 'text': text} for lang, text in items]
+
+
+def test_near_duplicates_are_clustered():
+    texts = _paragraphs(("en", CI_EN), ("en", PHENOMENON_EN), ("en", CI_EN_EDITION))
+
+    assert NearDuplicateDetector().cluster(texts) == [[0, 2], [1]]
+
+
+def test_cjk_near_duplicates_are_clustered():
+    texts = _paragraphs(("zh", CI_ZH), ("zh", CI_ZH_EDITION))
+
+    assert NearDuplicateDetector().cluster(texts) == [[0, 1]]
+
+
+def test_identical_text_in_different_languages_is_not_merged():
+    texts = _paragraphs(("en", CI_EN), ("de", CI_EN))
+
+    assert NearDuplicateDetector().cluster(texts) == [[0], [1]]
+
+
+def test_earliest_paragraph_is_representative():
+    # The duplicate pair only becomes connected to position 0 through position 2
+    texts = _paragraphs(("en", PHENOMENON_EN), ("en", CI_EN_EDITION), ("en", CI_EN), ("en", CI_EN_EDITION))
+
+    clusters = NearDuplicateDetector().cluster(texts)
+
+    assert clusters == [[0], [1, 2, 3]]
+    assert all(members == sorted(members) for members in clusters)
+
+
+def test_empty_paragraphs_are_not_merged():
+    texts = _paragraphs(("en", ""), ("en", "   \n"), ("en", CI_EN), ("en", ""))
+
+    assert NearDuplicateDetector().cluster(texts) == [[0], [1], [2], [3]]
+
+
+def test_signature_is_reproducible_for_same_seed():
+    assert (NearDuplicateDetector(seed=7).signature(CI_EN) == NearDuplicateDetector(seed=7).signature(CI_EN)).all()
+
+
+def test_signature_of_empty_text_is_none():
+    assert NearDuplicateDetector().signature("  ") is None
+
+
+def test_num_perm_must_divide_into_bands():
+    with pytest.raises(ValueError):
+        NearDuplicateDetector(num_perm=100, bands=32)
+
+
+def test_many_identical_paragraphs_cluster_quickly():
+    texts = _paragraphs(*[("en", CI_EN)] * 3000)
+
+    start = time.perf_counter()
+    clusters = NearDuplicateDetector().cluster(texts)
+    elapsed = time.perf_counter() - start
+
+    assert clusters == [list(range(3000))]
+    assert elapsed < 5.0
@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+from backend.rag.pipeline import gather_with_deadline
+
+
+async def _source(delay: float, value):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def _failing_source():
+    raise RuntimeError("source failed")
+
+
+def test_all_sources_finish_before_deadline():
+    results, errors = asyncio.run(gather_with_deadline(
+        {"dense": _source(0.01, "d"), "alias": _source(0, "a")},
+        timeout=1.0,
+        required=["dense"]
+    ))
+
+    assert results == {"dense": "d", "alias": "a"}
+    assert errors == {}
+
+
+def test_optional_source_slower_than_required_is_kept():
+    results, errors = asyncio.run(gather_with_deadline(
+        {"dense": _source(0.01, "d"), "graph": _source(0.05, "g")},
+        timeout=1.0,
+        required=["dense"]
+    ))
+
+    assert results == {"dense": "d", "graph": "g"}
+    assert errors == {}
+
+
+def test_optional_source_past_deadline_is_degraded():
+    results, errors = asyncio.run(gather_with_deadline(
+        {"dense": _source(0.01, "d"), "graph": _source(5, "g")},
+        timeout=0.1,
+        required=["dense"]
+    ))
+
+    assert results == {"dense": "d"}
+    assert isinstance(errors["graph"], asyncio.TimeoutError)
+
+
+def test_required_source_past_deadline_is_degraded():
+    results, errors = asyncio.run(gather_with_deadline(
+        {"dense": _source(5, "d"), "alias": _source(0, "a")},
+        timeout=0.1,
+        required=["dense"]
+    ))
+
+    assert results == {"alias": "a"}
+    assert isinstance(errors["dense"], asyncio.TimeoutError)
+
+
+def test_failed_source_reports_its_error():
+    results, errors = asyncio.run(gather_with_deadline(
+        {"dense": _source(0, "d"), "alias": _failing_source()},
+        timeout=1.0,
+        required=["dense"]
+    ))
+
+    assert results == {"dense": "d"}
+    assert isinstance(errors["alias"], RuntimeError)
+
+
+def test_required_failure_returns_without_waiting_for_optional():
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        outcome = await gather_with_deadline(
+            {"dense": _failing_source(), "graph": _source(5, "g")},
+            timeout=2.0,
+            required=["dense"]
+        )
+        return outcome, loop.time() - start
+
+    (results, errors), elapsed = asyncio.run(run())
+
+    assert results == {}
+    assert set(errors) == {"dense", "graph"}
+    assert elapsed < 1.0
+
+
+def test_pending_sources_are_cancelled_at_deadline():
+    async def run():
+        slow = asyncio.ensure_future(_source(5, "g"))
+        await gather_with_deadline({"dense": _source(0, "d"), "graph": slow}, timeout=0.05, required=["dense"])
+        await asyncio.sleep(0)
+        return slow
+
+    assert asyncio.run(run()).cancelled()
+
+
+def test_without_required_sources_waits_for_all_until_deadline():
+    results, errors = asyncio.run(gather_with_deadline(
+        {"a": _source(0.01, 1), "b": _source(5, 2)},
+        timeout=0.1
+    ))
+
+    assert results == {"a": 1}
+    assert set(errors) == {"b"}
+
+
+def test_hanging_optional_source_only_adds_grace_period():
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        outcome = await gather_with_deadline(
+            {"dense": _source(0.05, "d"), "graph": _source(10, "g")},
+            timeout=3.0,
+            required=["dense"],
+            optional_grace=0.05
+        )
+        return outcome, loop.time() - start
+
+    (results, errors), elapsed = asyncio.run(run())
+
+    assert results == {"dense": "d"}
+    assert isinstance(errors["graph"], asyncio.TimeoutError)
+    assert elapsed == pytest.approx(0.1, abs=0.05)
+
+
+def test_optional_source_within_grace_period_is_kept():
+    results, errors = asyncio.run(gather_with_deadline(
+        {"dense": _source(0.01, "d"), "graph": _source(0.03, "g")},
+        timeout=3.0,
+        required=["dense"],
+        optional_grace=0.5
+    ))
+
+    assert results == {"dense": "d", "graph": "g"}
+    assert errors == {}
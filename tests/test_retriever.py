@@ -0,0 +1,116 @@
+import json
+import pytest
+from backend.rag.dedup import NearDuplicateDetector
+from backend.rag.retriever import Retriever
+
+CI = "Kant introduces the concept of the categorical imperative as a fundamental principle of morality."
+CI_EDITION = "Kant introduces the concept of the categorical imperative as the fundamental principle of morality."
+PHENOMENON = "The phenomenon is the world as we experience it, while the noumenon is the thing-in-itself."
+GROUNDWORK = "Die Grundlegung zur Metaphysik der Sitten ist Kants Einführung in die Moralphilosophie."
+
+
+def _make_retriever(tmp_path, **kwargs):
+    return Retriever(vector_store_path=str(tmp_path / "vector_store.index"),
+                     texts_path=str(tmp_path / "texts"), **kwargs)
+
+
+@pytest.fixture
+def corpus(tmp_path, vectors, write_corpus):
+    vectors.update({
+        CI: [1, 0, 0],
+        CI_EDITION: [0.99, 0.1, 0],
+        PHENOMENON: [0, 1, 0],
+        GROUNDWORK: [0, 0, 1],
+        'QUERY': [1, 0, 0]
+    })
+    write_corpus(tmp_path / "texts", [
+        ("pure_reason", "1", "en", CI),
+        ("pure_reason", "2", "en", PHENOMENON),
+        ("pure_reason", "3", "en", CI_EDITION),
+        ("groundwork", "1", "de", GROUNDWORK)
+    ])
+    return tmp_path
+
+
+def test_index_holds_one_vector_per_cluster(corpus):
+    retriever = _make_retriever(corpus)
+
+    assert retriever.index.ntotal == 3
+    assert [(item['work_id'], item['para_id']) for item in retriever.texts_data] == [
+        ("pure_reason", "1"), ("pure_reason", "2"), ("groundwork", "1")
+    ]
+
+
+def test_duplicates_list_collapsed_paragraphs(corpus):
+    retriever = _make_retriever(corpus)
+
+    results = retriever.retrieve("categorical imperative", top_k=1)
+
+    assert results[0]['para_id'] == "1"
+    assert results[0]['duplicates'] == [{'work_id': "pure_reason", 'para_id': "3", 'lang': "en"}]
+    assert retriever.get_paragraph("pure_reason", "3", "en") is None
+
+
+def test_second_retriever_reuses_persisted_clusters(corpus, vectors, monkeypatch):
+    first = _make_retriever(corpus)
+    metadata = json.loads((corpus / "vector_store.index.meta.json").read_text())
+    assert metadata['fingerprint'] == first.fingerprint
+    assert metadata['clusters'] == [[0, 2], [1], [3]]
+
+    def fail_cluster(self, texts_data):
+        raise AssertionError("clusters should come from the metadata file")
+
+    monkeypatch.setattr(NearDuplicateDetector, "cluster", fail_cluster)
+    embed_calls = vectors.embed_texts_calls
+
+    second = _make_retriever(corpus)
+
+    assert second.clusters == first.clusters
+    assert second.index.ntotal == 3
+    assert vectors.embed_texts_calls == embed_calls
+
+
+def test_changed_text_rebuilds_clusters_and_index(corpus, vectors, write_corpus):
+    first = _make_retriever(corpus)
+
+    edited = "The phenomenon is the world as it appears to us."
+    vectors[edited] = [0, 1, 0]
+    write_corpus(corpus / "texts", [
+        ("pure_reason", "1", "en", CI),
+        ("pure_reason", "2", "en", edited),
+        ("pure_reason", "3", "en", CI_EDITION),
+        ("groundwork", "1", "de", GROUNDWORK)
+    ])
+    embed_calls = vectors.embed_texts_calls
+
+    second = _make_retriever(corpus)
+
+    assert second.fingerprint != first.fingerprint
+    assert vectors.embed_texts_calls == embed_calls + 1
+    assert second.get_paragraph("pure_reason", "2", "en")['text'] == edited
+    metadata = json.loads((corpus / "vector_store.index.meta.json").read_text())
+    assert metadata['fingerprint'] == second.fingerprint
+
+
+def test_diverse_prefers_distinct_passage_over_near_identical(tmp_path, vectors, write_corpus):
+    closest = "First rendering of a passage about the moral law."
+    near_copy = "Another rendering of that passage about the moral law."
+    distinct = "A passage about the limits of speculative reason."
+    vectors.update({
+        closest: [0.9, 0.436, 0],
+        near_copy: [0.89, 0.456, 0],
+        distinct: [0.8, 0, 0.6],
+        'QUERY': [1, 0, 0]
+    })
+    write_corpus(tmp_path / "texts", [
+        ("pure_reason", "1", "en", closest),
+        ("pure_reason", "2", "en", near_copy),
+        ("pure_reason", "3", "en", distinct)
+    ])
+    retriever = _make_retriever(tmp_path, deduplicate=False)
+
+    plain = retriever.retrieve("moral law", top_k=2)
+    diverse = retriever.retrieve("moral law", top_k=2, diverse=True)
+
+    assert [result['para_id'] for result in plain] == ["1", "2"]
+    assert [result['para_id'] for result in diverse] == ["1", "3"]
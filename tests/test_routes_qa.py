@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from backend.api import routes_qa
+from backend.app import app
+
+DOC = {'work_id': "groundwork", 'para_id': "1", 'lang': "en", 'text': "Act only according to that maxim.", 'score': 0.9}
+CI_MATCH = {'entity_id': "categorical_imperative", 'name': "Categorical Imperative", 'alias': "categorical imperative"}
+
+
+class FakeRetriever:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def retrieve(self, question, lang=None, diverse=False):
+        time.sleep(self.delay)
+        return [DOC]
+
+    def get_paragraph(self, work_id, para_id, lang):
+        return None
+
+
+class FakeAliasLookup:
+    def lookup(self, question):
+        return [CI_MATCH]
+
+
+class FakeGraphClient:
+    def __init__(self, neighbors=None, delay: float = 0.0, error: Exception = None):
+        self.neighbors = neighbors or []
+        self.delay = delay
+        self.error = error
+
+    async def neighbors_for_concepts(self, concept_ids, k=5):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.neighbors
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(routes_qa, "retriever", FakeRetriever())
+    monkeypatch.setattr(routes_qa, "alias_lookup", FakeAliasLookup())
+    monkeypatch.setattr(routes_qa, "graph_client", FakeGraphClient())
+    monkeypatch.setattr(routes_qa, "aligner", None)
+    monkeypatch.setattr(routes_qa, "QA_OPTIONAL_GRACE_SECONDS", 0.05)
+    return TestClient(app)
+
+
+def _ask(client, **extra):
+    return client.post("/qa/rag", json={"question": "What is the categorical imperative?", "lang": "en", **extra})
+
+
+def test_dense_timeout_returns_504(client, monkeypatch):
+    monkeypatch.setattr(routes_qa, "retriever", FakeRetriever(delay=0.3))
+
+    response = _ask(client, deadline=0.05)
+
+    assert response.status_code == 504
+
+
+def test_overloaded_search_returns_503(client, monkeypatch):
+    monkeypatch.setattr(routes_qa, "search_slots", threading.BoundedSemaphore(1))
+    routes_qa.search_slots.acquire()
+
+    response = _ask(client)
+
+    assert response.status_code == 503
+
+
+def test_non_positive_deadline_is_rejected(client):
+    assert _ask(client, deadline=0).status_code == 422
+
+
+@pytest.mark.parametrize("graph_client", [
+    FakeGraphClient(error=RuntimeError("neo4j unavailable")),
+    FakeGraphClient(delay=5)
+], ids=["failing", "slow"])
+def test_degraded_graph_returns_partial_response(client, monkeypatch, graph_client):
+    monkeypatch.setattr(routes_qa, "graph_client", graph_client)
+
+    start = time.perf_counter()
+    response = _ask(client)
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['partial'] is True
+    assert body['degraded_sources'] == ["graph"]
+    assert [evidence['para_id'] for evidence in body['evidence']] == ["1"]
+    assert [hit['entity_id'] for hit in body['graph_hits']] == ["categorical_imperative"]
+    assert elapsed < 1.0
+
+
+def test_graph_hits_exclude_alias_matched_concepts(client, monkeypatch):
+    monkeypatch.setattr(routes_qa, "graph_client", FakeGraphClient(neighbors=[
+        {'entity_id': "categorical_imperative", 'entity_type': "Concept", 'name': "Categorical Imperative", 'relationship': "RELATES_TO"},
+        {'entity_id': "kant", 'entity_type': "Person", 'name': "Immanuel Kant", 'relationship': "DEFINES"}
+    ]))
+
+    response = _ask(client)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['partial'] is False
+    assert body['degraded_sources'] == []
+    assert [(hit['entity_id'], hit['relationship']) for hit in body['graph_hits']] == [
+        ("categorical_imperative", "alias_match"),
+        ("kant", "DEFINES")
+    ]